@@ -18,5 +18,11 @@ from . import pe
 from .pe import Folder, active_folder, root_folder
 from .dc import Connector
 
+def __getattr__(name):
+    #numpy related names are created lazily in config
+    if name in config._NP_NAMES:
+        return getattr(config, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 modules = glob.glob(join(dirname(__file__), "*.py"))
 __all__ = [ basename(f)[:-3] for f in modules if isfile(f) and not f.endswith('__init__.py')]
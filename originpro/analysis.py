@@ -4,27 +4,69 @@ A package for interacting with Origin software via Python.
 Copyright (c) 2021 OriginLab Corporation
 """
 # pylint: disable=C0103,W0622,W0621,C0301,R0913,R0201
-import xml.etree.ElementTree as ET
+import re
+from contextlib import contextmanager
+from copy import deepcopy
 from .config import po
-from .utils import lt_tree_to_dict
+from .utils import lt_tree_to_dict, _APP_CACHE_CLEARS
+
+_RE_FUNCTION_MODEL = re.compile(r'<FunctionModel[^>]*>([^<]*)</FunctionModel>', re.I)
+_RE_NUM_DEPS = re.compile(r'<NumberOfDependentVariables[^>]*>\s*(\d+)', re.I)
+_RE_NUM_INDEPS = re.compile(r'<NumberOfIndependentVariables[^>]*>\s*(\d+)', re.I)
+_FDF_CACHE = {}
+#the fitting functions belong to the Origin instance, forget them on attach/detach/exit
+_APP_CACHE_CLEARS.append(_FDF_CACHE.clear)
+
+#direct tree node reader, looked up on first use since probing po with OriginExt needs a running Origin
+_TREE_GET = []
+
+def _tree_get():
+    if not _TREE_GET:
+        _TREE_GET.append(getattr(po, 'GetTreeNodeValue', None))
+    return _TREE_GET[0]
+
+@contextmanager
+def _no_nlfs_switch():
+    """
+    do not show Reminder Messagebox about switching to reportsheet, and set to no-switch, while running the report script.
+    Yields the LabTalk to send with the script, @NLFS is restored from here even if the script fails
+    """
+    oldVal = po.LT_evaluate('@NLFS')
+    try:
+        yield '@NLFS=0'
+    finally:
+        po.LT_set_var('@NLFS', oldVal)
+
+def _fdf_info(func):
+    """return (FunctionModel, NumberOfDependentVariables, NumberOfIndependentVariables) of a fitting function"""
+    info = _FDF_CACHE.get(func)
+    if info is None:
+        try:
+            xml = po.LT_get_str(f'GetFDFAsXML("{func}")$')
+            function_model = _RE_FUNCTION_MODEL.search(xml)
+            info = (function_model.group(1) if function_model else '',
+                    int(_RE_NUM_DEPS.search(xml).group(1)),
+                    int(_RE_NUM_INDEPS.search(xml).group(1)))
+        except Exception as e:
+            raise ValueError(f'Invalid fitting function: {func}') from e
+        _FDF_CACHE[func] = info
+    return info
 
 class NLFit:
     '''
     class for performing Non-Linear Curve Fitting with Origin's internal fitting engine
     The name of the fitting function already defined inside Origin must be provided to use this class
     '''
+    _TREE = '_PY_NLFIT_TREE'
+    _SET_FMT = _TREE + '.{}={}'
     def __init__(self, func, method='auto'):
         self._ended=False
+        self._pending=[]
+        self._result=None
         self.func=func
-        try:
-            self._trfdf = ET.fromstring(po.LT_get_str(f'GetFDFAsXML("{self.func}")$'))
-        except Exception as e:
-            raise ValueError(f'Invalid fitting function: {func}') from e
-        function_model = self._general_info('FunctionModel')
-        self._implicit = function_model is not None and function_model.text == 'Implicit'
+        function_model, self._numDeps, self._numIndeps = _fdf_info(func)
+        self._implicit = function_model == 'Implicit'
         self._odr = False
-        self._numDeps = int(self._general_info('NumberOfDependentVariables').text)
-        self._numIndeps = int(self._general_info('NumberOfIndependentVariables').text)
         if method == 'auto':
             self._odr = self._implicit
         elif method == 'odr':
@@ -36,70 +78,65 @@ class NLFit:
             raise ValueError(f'Invalid fitting method: {method}')
 
     def __del__(self):
-        tr = self._get_tree_name()
-        po.LT_execute(f'del -vt {tr}')
-
-    def _get_tree_name(self):
-        return '_PY_NLFIT_TREE'
+        po.LT_execute(f'del -vt {self._TREE}')
 
     def _set(self, property, value):
-        tr = self._get_tree_name()
-        strLT = f'{tr}.{property}={value}'
-        po.LT_execute(strLT)
-
-    def _get(self, property):
-        tr = self._get_tree_name()
-        return po.LT_evaluate(f'{tr}.{property}')
+        self._pending.append(self._SET_FMT.format(property, value))
 
-    def _func_section(self, section):
-        sec = self._trfdf.find(section)
-        if sec:
-            return sec
-        return self._trfdf.find(section.upper())
+    def _flush(self):
+        'execute all buffered tree assignments in a single LabTalk call'
+        if self._pending:
+            ok = po.LT_execute(';'.join(self._pending))
+            self._pending.clear()
+            self._result = None
+            if ok is False:
+                raise ValueError('Invalid fitting setting, LabTalk skipped the settings after it')
 
-    def _general_info(self, key):
-        return self._func_section('GeneralInformation').find(key)
+    def _get(self, property):
+        self._flush()
+        getter = _tree_get()
+        if getter is not None:
+            return getter(self._TREE, property)
+        return po.LT_evaluate(f'{self._TREE}.{property}')
+
+    def _begin(self, xf, rng):
+        'start the fitting session'
+        self._flush()
+        po.LT_execute(f'{xf} {rng} {self.func} {self._TREE}')
+        self._ended=False
 
     def set_data(self, wks, x, y, yerr='', xerr='', z=''):
         """
         set the XY data with optional error bar column, or XYZ data
         """
         rng = wks.to_xy_range(x, y, z if z else yerr, xerr)
-        tr = self._get_tree_name()
         xf = 'nlbegin'
         if z:
             xf += 'z'
         elif self._odr:
             xf += 'o'
-        po.LT_execute(f'{xf} {rng} {self.func} {tr}')
-        self._ended=False
+        self._begin(xf, rng)
 
     def set_mdata(self, ms, z):
         """
         set the Matrix data
         """
         if isinstance(z, int):
-            z =+ 1
+            z += 1
         rng = f'{ms.lt_range(False)}!{z}'
-        tr = self._get_tree_name()
-        strLT=f'nlbeginm {rng} {self.func} {tr}'
-        po.LT_execute(strLT)
-        self._ended=False
+        self._begin('nlbeginm', rng)
 
     def set_range(self, rg):
         """
         set data as range string
         """
-        tr = self._get_tree_name()
         xf = 'nlbegin'
         if self._odr:
             xf += 'o'
         if not ((self._implicit and self._numIndeps == 2) or
                 (not self._implicit and self._numDeps == 1 and self._numIndeps == 1)):
             xf += 'r'
-        strLT=f'{xf} {rg} {self.func} {tr}'
-        po.LT_execute(strLT)
-        self._ended=False
+        self._begin(xf, rg)
 
     def fix_param(self, p, val):
         """
@@ -140,6 +177,8 @@ class NLFit:
             model.fit()
             rr=model.result()
         """
+        self._flush()
+        self._result = None
         po.LT_execute('nlpara 1')
 
     def fit(self, iter=''):
@@ -149,6 +188,8 @@ class NLFit:
         Parameters:
             iter (str or int): empty will iterate until converge, otherwise to specify the number of iterations
         """
+        self._flush()
+        self._result = None
         po.LT_execute(f'nlfit {iter}')
 
     def result(self):
@@ -158,12 +199,14 @@ class NLFit:
         Return:
             (dict) fitting parameters and statistics from the fit
         """
+        self._flush()
         if not self._ended:
             po.LT_execute('nlend')
             self._ended = True
-        tr = self._get_tree_name()
-        d = lt_tree_to_dict(f'{tr}')
-        return d
+            self._result = None
+        if self._result is None:
+            self._result = lt_tree_to_dict(self._TREE)
+        return deepcopy(self._result)
 
     def report(self, autoupdate=False):
         """
@@ -185,39 +228,39 @@ class NLFit:
         if self._ended:
             raise ValueError('You must call report() before calling result().')
 
-        oldVal=po.LT_evaluate('@NLFS')
-        po.LT_set_var('@NLFS',0)#do not show Reminder Messagebox about switching to reportsheet, and set to no-switch
-        if autoupdate:
-            po.LT_execute('nlend 1 1')
-        else:
-            po.LT_execute('nlend 1')
+        self._flush()
+        with _no_nlfs_switch() as nlfs_off:
+            po.LT_execute(f"{nlfs_off};{'nlend 1 1' if autoupdate else 'nlend 1'}")
         self._ended = True
-        po.LT_set_var('@NLFS',oldVal)
         return po.LT_get_str('__REPORT'), po.LT_get_str('__FITCURVE')
 
 class LinearFit:
     '''
     class for performing Linear Fitting with Origin's internal fitting engine
     '''
+    _TREE = '_PY_LR_TREE'
+    _OUTPUT_TREE = '_PY_LR_OUTPUT'
+    _SET_FMT = _TREE + '.GUI.{}={}'
+
     def __init__(self):
-        strGUITreeName = self._get_tree_name()
-        po.LT_execute(f'Tree {strGUITreeName}')
-        strLT = f'xop execute:=init classname:=FitLinear iotrgui:={strGUITreeName}'
+        self._pending = []
+        po.LT_execute(f'Tree {self._TREE}')
+        strLT = f'xop execute:=init classname:=FitLinear iotrgui:={self._TREE}'
         po.LT_execute(strLT)
 
     def __del__(self):
-        tr = self._get_tree_name()
-        po.LT_execute(f'del -vt {tr}')
-
-    def _get_tree_name(self):
-        return '_PY_LR_TREE'
-    def _get_output_tree_name(self):
-        return '_PY_LR_OUTPUT'
+        po.LT_execute(f'del -vt {self._TREE}')
 
     def _set(self, property, value):
-        tr = self._get_tree_name()
-        strLT = f'{tr}.GUI.{property}={value}'
-        po.LT_execute(strLT)
+        self._pending.append(self._SET_FMT.format(property, value))
+
+    def _flush(self):
+        'execute all buffered tree assignments in a single LabTalk call'
+        if self._pending:
+            ok = po.LT_execute(';'.join(self._pending))
+            self._pending.clear()
+            if ok is False:
+                raise ValueError('Invalid fitting setting, LabTalk skipped the settings after it')
 
     def set_data(self, wks, x, y, err = ''):
         """
@@ -256,9 +299,9 @@ class LinearFit:
             b_err   =rr['Parameters']['Slope']['Error']
 
         """
-        trOut = self._get_output_tree_name()
-        strGUITreeName = self._get_tree_name()
-        strLT = f'xop execute:=run iotrgui:={strGUITreeName} otrresult:={trOut}'
+        trOut = self._OUTPUT_TREE
+        strLT = f'xop execute:=run iotrgui:={self._TREE} otrresult:={trOut}'
+        self._flush()
         po.LT_execute(strLT)
         dd = lt_tree_to_dict(trOut)
         po.LT_execute(f'del -vt {trOut}')
@@ -285,12 +328,9 @@ class LinearFit:
             self._set('Graph1.ConfBands',1)
         if band & 2:
             self._set('Graph1.PredBands',1)
-        strGUITreeName = self._get_tree_name()
-        strLT = f'xop execute:=report iotrgui:={strGUITreeName}'
-
-        oldVal=po.LT_evaluate('@NLFS')
-        po.LT_set_var('@NLFS',0)#do not show Reminder Messagebox about switching to reportsheet, and set to no switch
-        po.LT_execute(strLT)
-        po.LT_set_var('@NLFS',oldVal)
+        strLT = f'xop execute:=report iotrgui:={self._TREE}'
+        self._flush()
+        with _no_nlfs_switch() as nlfs_off:
+            po.LT_execute(f'{nlfs_off};{strLT}')
 
         return po.LT_get_str('__REPORT'), po.LT_get_str('__FITCURVE')
@@ -5,34 +5,56 @@ Copyright (c) 2020 OriginLab Corporation
 """
 # pylint: disable=C0103,C0301,R0913
 import abc
+from functools import lru_cache
 import xml.etree.ElementTree as ET
 from .config import po, oext, _EXIT, _OBJS_COUNT
 from .utils import origin_class, get_file_ext, _tree_to_dict, lt_empty_tree, ocolor
 from .dc import Connector
 
+_EXT_TO_DC = {
+    '.csv': 'csv',
+    '.asc': 'csv',
+    '.txt': 'csv',
+    '.dat': 'csv',
+    '.xls': 'excel',
+    '.xlsx': 'excel',
+}
+
 def _DC_from_ext(ext):
-    if ext in ['.csv', '.asc', '.txt', '.dat']:
-        return 'csv'
-    if ext in ['.xls', '.xlsx']:
-        return 'excel'
+    try:
+        return _EXT_TO_DC[ext]
+    except KeyError:
+        raise ValueError('file type not supported, must be text or Excel files') from None
+
 
-    raise ValueError('file type not supported, must be text or Excel files')
+@lru_cache(maxsize=8)
+def _book_type_for(cls):
+    if issubclass(cls, origin_class('WorksheetPage')):
+        return 'w'
+    if issubclass(cls, origin_class('MatrixPage')):
+        return 'm'
+    raise ValueError('wrong object type')
 
 
 class BaseObject:
     """base class for all Origin objects"""
-    def __init__(self, obj):
-        if oext:
+    __slots__ = ('obj',)
+    #object counting is only needed for external Python, so decide once here instead of per instance
+    if oext:
+        def __init__(self, obj):
             _OBJS_COUNT[0] += 1
-        if obj is None:
-            raise TypeError
-        self.obj = obj
-        #print('constructor for ' + str(type(self.obj).__name__))
-    def __del__(self):
-        if oext:
+            if obj is None:
+                raise TypeError
+            self.obj = obj
+        def __del__(self):
             _OBJS_COUNT[0] -= 1
             if _EXIT[0] and not _OBJS_COUNT[0]:
                 po.Detach()
+    else:
+        def __init__(self, obj):
+            if obj is None:
+                raise TypeError
+            self.obj = obj
     def __str__(self):
         return self.obj.GetName()
     def __bool__(self):
@@ -47,10 +69,8 @@ class BaseObject:
         return self.obj.GetStrProp(prop)
     def get_int(self, prop):
         """Get object's LabTalk int property"""
-        try:
-            return int(self.get_float(prop))
-        except ValueError:
-            return 0
+        val = self.obj.GetNumProp(prop)
+        return int(val) if val == val else 0 #NaN for missing value
     def get_float(self, prop):
         """Get object's LabTalk float property"""
         return self.obj.GetNumProp(prop)
@@ -65,10 +85,8 @@ class BaseObject:
         self.obj.SetNumProp(prop, value)
     def method_int(self, name, arg=''):
         """execute object's LabTalk method that has an int return"""
-        try:
-            return int(self.method_float(name, arg))
-        except ValueError:
-            return 0
+        val = self.obj.DoMethod(name, arg)
+        return int(val) if val == val else 0 #NaN for missing value
     def method_float(self, name, arg=''):
         """execute object's LabTalk method that has a float return"""
         return self.obj.DoMethod(name, arg)
@@ -243,6 +261,7 @@ class BaseObject:
 
 class BaseLayer(BaseObject):
     """base class for all Origin layers"""
+    __slots__ = ()
     def __str__(self):
         graph = self.obj.GetParent()
         return f'[{graph.GetName()}]{self.obj.GetName()}'
@@ -256,12 +275,10 @@ class BaseLayer(BaseObject):
             wb.add_sheet()
             wks.activate()
         """
-        page = BasePage(self.obj.GetParent())
-        if not page.is_active():
-            page.activate()
-        last_act = page.get_int('Active')
-        page.set_int('Active', self.index()+1)
-        return last_act
+        page = self.obj.GetParent()
+        last_act = page.GetNumProp('Active')
+        po.LT_execute(f'win -a {page.GetName()};page.active={self.index()+1}')
+        return int(last_act) if last_act == last_act else 0 #NaN for missing value
 
     def destroy(self):
         """
@@ -273,6 +290,7 @@ class BasePage(BaseObject):
     """
     base class for all Origin books and graph, it holds a PyOrigin Page
     """
+    __slots__ = ()
     def __len__(self):
         return self.obj.Layers.GetCount()
 
@@ -294,8 +312,7 @@ class BasePage(BaseObject):
         """
         Returns whether book is currently active
         """
-        act_name = po.LT_get_str('%H')
-        return act_name == self.name
+        return po.LT_get_str('%H') == self.name
 
     def lt_range(self):
         """return the Origin Range String that iddentify page object"""
@@ -326,15 +343,12 @@ class BasePage(BaseObject):
 
 class DBook(BasePage):
     """base class for data books, like workbook and matrix book"""
+    __slots__ = ()
     def __repr__(self):
         return f'{type(self).__name__}: ' + self.lt_range()
 
     def _get_book_type(self):
-        if isinstance(self.obj, origin_class('WorksheetPage')):
-            return 'w'
-        if isinstance(self.obj, origin_class('MatrixPage')):
-            return 'm'
-        raise ValueError('wrong object type')
+        return _book_type_for(type(self.obj))
 
     def __getitem__(self, index):
         return self._sheet(self.obj.Layers(index))
@@ -353,11 +367,18 @@ class DBook(BasePage):
     def _sheet(self, obj):
         raise ValueError(f'{self.lt_range()} Derived class must define its own _sheet method!')
 
+#whether the PyOrigin sheet class provides a combined GetShape(), found on first use
+_HAS_GETSHAPE = {}
+
 def _layer_range(obj, use_name):
-    return f'[{obj.GetParent().GetName()}]{obj.GetName() if use_name else obj.GetIndex() + 1}'
+    book = '[' + obj.GetParent().GetName() + ']'
+    if use_name:
+        return book + obj.GetName()
+    return book + str(obj.GetIndex() + 1)
 
 class DSheet(BaseLayer):
     """base class for data sheets, like worksheets and matrix sheets"""
+    __slots__ = ()
     def __str__(self):
         return self.lt_range()
     def __repr__(self):
@@ -368,6 +389,12 @@ class DSheet(BaseLayer):
     @property
     def shape(self):
         """return the rows and columns of a sheet"""
+        cls = type(self.obj)
+        has_getshape = _HAS_GETSHAPE.get(cls)
+        if has_getshape is None:
+            has_getshape = _HAS_GETSHAPE[cls] = hasattr(cls, 'GetShape')
+        if has_getshape:
+            return tuple(self.obj.GetShape())
         return self.obj.GetRowCount(), self.obj.GetColCount()
     @shape.setter
     def shape(self, val):
@@ -12,6 +12,7 @@ try:
 except ImportError:
     import OriginExt
     import atexit
+    from types import MethodType
     class APP:
         'OriginExt.Application() wrapper'
         def __init__(self):
@@ -19,17 +20,23 @@ except ImportError:
             self._first = True
         def __getattr__(self, name):
             try:
-                return getattr(OriginExt, name)
+                val = getattr(OriginExt, name)
             except AttributeError:
-                pass
-            if self._app is None:
-                self._app = OriginExt.Application()
-            return getattr(self._app, name)
+                if self._app is None:
+                    self._app = OriginExt.Application()
+                val = getattr(self._app, name)
+                #only bound methods are safe to keep, properties like ActivePage must be fetched each time
+                if not isinstance(val, MethodType):
+                    return val
+            self.__dict__[name] = val
+            return val
         def Exit(self, releaseonly=False):
             'Exit if Application exists'
             if self._app is not None:
                 self._app.Exit(releaseonly)
                 self._app = None
+                for name in [k for k, v in self.__dict__.items() if isinstance(v, MethodType)]:
+                    del self.__dict__[name]
         def Attach(self):
             'Attach to exising Origin instance'
             releaseonly = True
@@ -50,7 +57,10 @@ except ImportError:
             po.Detach()
     atexit.register(_exit_handler)
 
-try:
+#numpy and the data type maps are only set up on first access, see __getattr__ below
+_NP_NAMES = ('np', 'npdtype_to_orgdtype', 'orgdtype_to_npdtype', 'npdtype_num_to_orgdtype', 'orgdtype_to_npdtype_obj')
+
+def _build_dtype_maps():
     import numpy as np
     npdtype_to_orgdtype = {
         np.float64: po.DF_DOUBLE,
@@ -63,6 +73,20 @@ try:
         np.uint32: po.DF_ULONG,
         np.complex128: po.DF_COMPLEX,
     }
-    orgdtype_to_npdtype = {v: k for k, v in npdtype_to_orgdtype.items()}
-except ImportError:
-    pass
+    globals().update(
+        np=np,
+        npdtype_to_orgdtype=npdtype_to_orgdtype,
+        orgdtype_to_npdtype={v: k for k, v in npdtype_to_orgdtype.items()},
+        npdtype_num_to_orgdtype={np.dtype(k).num: v for k, v in npdtype_to_orgdtype.items()},
+        orgdtype_to_npdtype_obj={v: np.dtype(k) for k, v in npdtype_to_orgdtype.items()},
+    )
+
+def __getattr__(name):
+    if name in _NP_NAMES:
+        try:
+            _build_dtype_maps()
+        except ImportError:
+            pass
+        else:
+            return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -4,8 +4,35 @@ A package for interacting with Origin software via Python.
 Copyright (c) 2020 OriginLab Corporation
 """
 # pylint: disable=C0103
+from contextlib import contextmanager
 from .config import po
-from .utils import lt_tree_to_dict, lt_dict_to_tree, lt_delete_tree
+from .utils import lt_tree_to_flat, lt_dict_to_tree, lt_delete_tree, _flat_to_dict, _dict_to_flat
+
+_OPTN_TREE = '_trTmpDCSettings'
+_OPTN_FETCH = f'tree {_OPTN_TREE} = wks.dc.optn$'
+_OPTN_PUSH = f'{_OPTN_TREE}.tostring(wks.dc.optn$)'
+_OPTN_DELETE = f'del -vt {_OPTN_TREE}'
+
+def _leaf_assignments(flat, saved):
+    """
+    LabTalk assignments for the leaves in flat that differ from saved, both are dict of path to value.
+    Returns None if a change cannot be expressed as a leaf assignment (added or removed nodes, attributes etc)
+    """
+    if flat.keys() != saved.keys():
+        return None
+    changes = []
+    for path, val in flat.items():
+        if val == saved[path]:
+            continue
+        node = f'{_OPTN_TREE}.{path}'
+        if isinstance(val, (int, float)) and not isinstance(val, bool):
+            changes.append(f'{node}={val}')
+        else:
+            val = str(val)
+            if any(c in val for c in '";\r\n'):
+                return None
+            changes.append(f'{node}$="{val}"')
+    return changes
 
 class Connector:
     r'''
@@ -32,14 +59,18 @@ class Connector:
         if not dctype:
             dctype = currentDC if currentDC else 'csv'
         self.dc = dctype.lower()
+        #Import Filter Connector need to do wks.dc.Import(1) in order to find the OIF filter
+        self._imp_arg = '1' if self.dc == 'import filter' else ''
         if currentDC and currentDC != self.dc:
             self.wks.remove_DC()
             currentDC = ''
         if not currentDC:
             self.wks.obj.DoMethod('DC.Allow', '2') #this will reset old import info in the book
             self.wks.lt_exec(f'wbook.dc.add({self.dc})')
-        self._trLTname = '_trTmpDCSettings'
+        self._trLTname = _OPTN_TREE
         self._trOptn = None
+        self._trOptnSaved = None #flat leaves of the settings as they are in Origin, to know if imp() must write them back
+        self._sparks_managed = False
 
     def __del__(self):
         if not self.keep:
@@ -88,29 +119,66 @@ class Connector:
         """
         self.wks.lt_exec(f'wbook.dc.newsheet({name})')
 
+    @contextmanager
+    def sparks(self, enabled=False):
+        """
+            Set the sparklines option once for a block of imp() calls,
+            the sparks argument of imp() is ignored inside the block
+
+        Parameters:
+            enabled (bool): True will follow GUI setting to add sparklines, False will disable it completely
+
+        Examples:
+            with dc.sparks(False):
+                for f in files:
+                    dc.imp(f)
+        """
+        oldspark = int(po.LT_get_var('@IMPS'))
+        po.LT_set_var('@IMPS', 1 if enabled else 0)
+        self._sparks_managed = True
+        try:
+            yield self
+        finally:
+            self._sparks_managed = False
+            po.LT_set_var('@IMPS', oldspark)
+
     def _optn(self):
         if not self._trOptn:
-            self.wks.lt_exec(f'tree {self._trLTname} = wks.dc.optn$')
-            self._trOptn = lt_tree_to_dict(self._trLTname)
+            self.wks.lt_exec(_OPTN_FETCH)
+            flat = lt_tree_to_flat(self._trLTname)
             lt_delete_tree(self._trLTname)
+            if flat is not None:
+                self._trOptnSaved = dict(flat)
+                self._trOptn = _flat_to_dict(flat)
         return self._trOptn
 
     def imp(self, fname='', sel='', sparks=False):
         '''Import file'''
         optn = self._trOptn
-        if optn:
-            lt_dict_to_tree(optn, self._trLTname, True, True)
-            self.wks.lt_exec(f'{self._trLTname}.tostring(wks.dc.optn$)')
-            lt_delete_tree(self._trLTname)
+        flat = dict(_dict_to_flat(optn)) if optn else None
+        if flat and flat != self._trOptnSaved:
+            changes = _leaf_assignments(flat, self._trOptnSaved)
+            if changes is not None:
+                #only assign the modified leaves on top of the current settings
+                self.wks.lt_exec(';'.join([_OPTN_FETCH, *changes, _OPTN_PUSH, _OPTN_DELETE]))
+            else:
+                lt_dict_to_tree(optn, self._trLTname, True, True)
+                self.wks.lt_exec(_OPTN_PUSH)
+                lt_delete_tree(self._trLTname)
+            self._trOptnSaved = flat
         if fname:
             self.source = fname
-        #Import Filter Connector need to do wks.dc.Import(1) in order to find the OIF filter
-        imp_arg = '1' if self.dc=='Import Filter' else ''
+        imp_arg = self._imp_arg
         if sel:
             self.wks.set_str('DC.Sel', sel)
             imp_arg = ''
-        oldspark=int(po.LT_get_var('@IMPS'))
-        newspark = 1 if sparks else 0
-        po.LT_set_var("@IMPS", newspark)
-        self.wks.method_int('dc.import', imp_arg)
-        po.LT_set_var("@IMPS", oldspark)
+        if self._sparks_managed:
+            self.wks.method_int('dc.import', imp_arg)
+            return
+        oldspark = int(po.LT_get_var('@IMPS'))
+        po.LT_set_var('@IMPS', 1 if sparks else 0)
+        try:
+            self.wks.method_int('dc.import', imp_arg)
+        finally:
+            #restore from here so a failed import cannot leave sparklines changed
+            po.LT_set_var('@IMPS', oldspark)
@@ -4,22 +4,74 @@ A package for interacting with Origin software via Python.
 Copyright (c) 2020 OriginLab Corporation
 """
 # pylint: disable=C0301,C0103,C0302,W0622,R0913,W0212
+from contextlib import contextmanager
 from .config import po
 from .base import BaseObject, BaseLayer, BasePage, _layer_range
 from .utils import to_rgb, ocolor, get_file_parts, last_backslash, origin_class
 
+#stack of (layer obj, pending LabTalk assignments) for GLayer.batch()
+_BATCH = []
+
+_AXIS_TYPES = {'x':2, 'y':4, 'z':1}
+#from, to, inc property names per axis
+_LIMIT_KEYS = {ax: (f'{ax}.from', f'{ax}.to', f'{ax}.inc') for ax in _AXIS_TYPES}
+_SCALE_NAMES = {'linear': 1, 'log10': 2, 'probability': 3, 'probit': 4, 'reciprocal': 5,
+                'offset_reciprocal': 6, 'logit': 7, 'ln': 8, 'log2': 9}
+_LABEL_NAMES = {'x': 'xb', 'x2': 'xt', 'y': 'yl', 'y2': 'yr', 'z': 'zb', 'z2': 'zf'}
+_PLOT_TYPE_SHORT = {
+    "line":'l',
+    "scatter":'s',
+    "linesymbol":'y',
+    "column":'c',
+    "contour":'contour',
+    }
+_PLOT_TYPE_CODES = {
+    "?": 230,
+    "l": 200,
+    "s": 201,
+    "y": 202,
+    "c": 203,
+    "contour": 226,
+    }
+
+_EXPGRAPH = 'expgraph -sw'#silent warning messages
+#save_fig with all defaults, re-export with the settings remembered in the graph
+_EXPGRAPH_AUTO = _EXPGRAPH + ' -t <book> overwrite:=replace'
+
+def _axis_limits(layer, ax):
+    return tuple(layer.GetNumProp(key) for key in _LIMIT_KEYS[ax])
+
+def _set_axis_limits(layer, ax, begin=None, end=None, step=None):
+    if end is None and step is None and isinstance(begin, (tuple, list)):
+        if len(begin) == 3:
+            begin, end, step = begin
+        elif len(begin) == 2:
+            begin, end = begin
+        else:
+            raise ValueError('must specify 2 or 3 values')
+
+    cmds = [f'layer.{key}={val}' for key, val in zip(_LIMIT_KEYS[ax], (begin, end, step)) if val is not None]
+    if cmds:
+        layer.LT_execute(';'.join(cmds))
+
+def _parse_zlevels(buf):
+    """parse 'minors|z1|z2|...|zabove' into minors and the major levels"""
+    minors, *levels = buf.split('|')
+    minors = int(minors)
+    levels = list(map(float, levels))
+    if minors > 0:
+        levels = levels[::minors+1]
+    return minors, levels
 
 class Axis:
     """
     This class represents an instance of Axis on a GLayer.
     """
+    __slots__ = ('layer', 'type', 'ax')
 
     def __init__(self, obj, ax):
         self.layer = obj
-        types = {
-            'x':2,'y':4,'z':1
-            }
-        self.type = types[ax]
+        self.type = _AXIS_TYPES[ax]
         self.ax = ax
 
     @property
@@ -60,12 +112,12 @@ class Axis:
         if isinstance(value, int):
             self.layer.SetNumProp(f'{self.ax}.type', value)
         elif isinstance(value, str):
-            scales = {'linear': 1, 'log10': 2, 'probability': 3, 'probit': 4, 'reciprocal': 5,
-                      'offset_reciprocal': 6, 'logit': 7, 'ln': 8, 'log2': 9}
-            self.scale = scales.get(value)
+            num = _SCALE_NAMES.get(value)
+            if num is None:
+                raise ValueError(f'unknown scale type {value!r}')
+            self.layer.SetNumProp(f'{self.ax}.type', num)
         else:
             raise TypeError('unknown scale type')
-        return self.scale
 
     @property
     def limits(self):
@@ -80,7 +132,7 @@ class Axis:
         Examples:
             from, to, inc = ax.limits
         """
-        return self.sfrom, self.sto, self.sstep
+        return _axis_limits(self.layer, self.ax)
 
     @limits.setter
     def limits(self, limits):
@@ -96,7 +148,7 @@ class Axis:
         Examples:
             ax.limits = (1, 10, 1)
         """
-        self.set_limits(limits)
+        _set_axis_limits(self.layer, self.ax, limits)
 
     def set_limits(self, begin=None, end=None, step=None):
         """
@@ -121,21 +173,8 @@ class Axis:
             #return self.limits
         #elif sto is None and isinstance(sfrom, (tuple, list)):
         #    sfrom, sto = sfrom
-        if end is None and step is None and isinstance(begin, (tuple, list)):
-            if len(begin) == 3:
-                begin, end, step = begin
-            elif len(begin) == 2:
-                begin, end = begin
-            else:
-                raise ValueError('must specify 2 or 3 values')
-
-        if begin is not None:
-            self.sfrom = begin
-        if end is not None:
-            self.sto = end
-        if step is not None:
-            self.sstep = step
-        return self.limits
+        _set_axis_limits(self.layer, self.ax, begin, end, step)
+        return _axis_limits(self.layer, self.ax)
 
     @property
     def title(self):
@@ -150,11 +189,8 @@ class Axis:
         Examples:
             txt = ax.title
         """
-        label_name = {'x': 'xb', 'x2': 'xt', 'y': 'yl', 'y2': 'yr', 'z': 'zb', 'z2': 'zf'}[self.ax]
-        label = GLayer(self.layer).label(label_name)
-        if label is None:
-            return ''
-        return label.text
+        lb = self.layer.GraphObjects(_LABEL_NAMES[self.ax])
+        return '' if lb is None else lb.Text
 
     @title.setter
     def title(self, value):
@@ -165,21 +201,21 @@ class Axis:
             value (str): Title text
 
         Returns:
-            (str) Title
+            None
 
         Examples:
             ax.title = 'X Axis'
         """
-        label_name = {'x': 'xb', 'x2': 'xt', 'y': 'yl', 'y2': 'yr', 'z': 'zb', 'z2': 'zf'}[self.ax]
+        label_name = _LABEL_NAMES[self.ax]
         cmd = f'label -{label_name} {value}'
         self.layer.LT_execute(cmd)
-        return self.title
 
 
 class Label(BaseObject):
     """
     This class represents an instance of a text object on a GLayer.
     """
+    __slots__ = ('layer',)
     def __init__(self, obj, layer):
         self.layer=layer
         super().__init__(obj)
@@ -251,7 +287,7 @@ class Label(BaseObject):
         return self.obj.Text
 
     @text.setter
-    def text(self, text: str) -> str:
+    def text(self, text: str):
         """
         Property setter for object text.
 
@@ -259,22 +295,32 @@ class Label(BaseObject):
             value (str): Text
 
         Returns:
-            (str) Object text
+            None
         """
         self.obj.Text = text
-        return self.text
 
 class Plot(BaseObject):
     """
     This class represents an instance of a data plot in a GLayer.
     """
+    __slots__ = ('layer', '_prefix')
     def __init__(self, obj, layer):
         self.layer=layer
+        self._prefix = None
         super().__init__(obj)
 
     def _format_property(self, prop):
-        nplot = self.index() + 1
-        return f'plot{nplot}.{prop}'
+        #plot index is looked up once, so a Plot object goes stale if plots are reordered or removed
+        if self._prefix is None:
+            self._prefix = f'plot{self.index() + 1}.'
+        return self._prefix + prop
+
+    def _set_num(self, prop, value):
+        """SetNumProp, or buffer the assignment if inside a GLayer.batch() of this plot's layer"""
+        if _BATCH and _BATCH[-1][0] is self.layer:
+            _BATCH[-1][1].append(f'{self._format_property(prop)}={value}')
+        else:
+            self.layer.SetNumProp(self._format_property(prop), value)
 
     def lt_range(self):
         """Return the Origin Range String that identify Data Plot object"""
@@ -314,7 +360,7 @@ class Plot(BaseObject):
         See Also:
             ocolor(rgb)
         """
-        self.layer.SetNumProp(self._format_property('color'), ocolor(rgb))
+        self._set_num('color', ocolor(rgb))
 
     @property
     def colorinc(self):
@@ -347,7 +393,7 @@ class Plot(BaseObject):
             p = g[0].add_plot(wks,'(0,1)')
             p.colorinc = 1
         """
-        self.layer.SetNumProp(self._format_property('colorinc'), inc)
+        self._set_num('colorinc', inc)
 
     @property
     def colormap(self):
@@ -383,13 +429,14 @@ class Plot(BaseObject):
             p.colormap = 'Maple.pal' # palette
         """
         namelow = name.lower()
+        cmap = self._format_property('cmap.')
         if namelow.endswith('.pal') or namelow.endswith('.xml'):
-            self.layer.SetStrProp(self._format_property('cmap.palette'), name)
-            self.layer.SetNumProp(self._format_property('cmap.stretchpal'), 1)
+            self.layer.SetStrProp(cmap + 'palette', name)
+            self.layer.SetNumProp(cmap + 'stretchpal', 1)
         else:
             self.layer.SetStrProp(self._format_property('colorlist'), name)
-            self.layer.SetNumProp(self._format_property('cmap.stretchpal'), 0)
-        self.layer.SetNumProp(self._format_property('cmap.linkpal'), 1)
+            self.layer.SetNumProp(cmap + 'stretchpal', 0)
+        self.layer.SetNumProp(cmap + 'linkpal', 1)
 
     def set_shapelist(self, name):
         """
@@ -418,18 +465,26 @@ class Plot(BaseObject):
 
 
         """
-        numlevels = int(self.layer.GetNumProp(self._format_property('cmap.numcolors')))
-        listzlevels = []
-        for ilevel in range(numlevels):
-            propname = f'cmap.z{ilevel + 1}'
-            zval = self.layer.GetNumProp(self._format_property(propname))
-            listzlevels.append(zval)
-
-        zabove = self.layer.GetNumProp(self._format_property('cmap.zabove'))
-        listzlevels.append(zabove)
-        minors = int(self.layer.GetNumProp(self._format_property('cmap.NumMinorLevels')))
-        if minors > 0:
-            listzlevels = listzlevels[::minors+1]
+        #collect minors|z1|z2|...|zabove into one string so that it takes a single round trip to get all levels,
+        #17 significant digits so the doubles read back exactly
+        strTempLTvarName = '__opZLevelsVar$'
+        cmap = self._format_property('cmap.')
+        self.layer.LT_execute(f'{strTempLTvarName}="$({cmap}NumMinorLevels)";'
+                              f'loop(__opZi,1,{cmap}numcolors){{__opZv={cmap}z$(__opZi);{strTempLTvarName}={strTempLTvarName}+"|$(__opZv,*17)";}};'
+                              f'__opZv={cmap}zabove;{strTempLTvarName}={strTempLTvarName}+"|$(__opZv,*17)";'
+                              'del -v __opZi;del -v __opZv')
+        strVarValue = po.LT_get_str(strTempLTvarName)
+        po.LT_execute(f'del -v {strTempLTvarName}')
+        try:
+            minors, listzlevels = _parse_zlevels(strVarValue)
+        except ValueError:
+            #number formatting does not round trip, like missing values, so get the levels one by one
+            numlevels = int(self.layer.GetNumProp(cmap + 'numcolors'))
+            listzlevels = [self.layer.GetNumProp(f'{cmap}z{ilevel + 1}') for ilevel in range(numlevels)]
+            listzlevels.append(self.layer.GetNumProp(cmap + 'zabove'))
+            minors = int(self.layer.GetNumProp(cmap + 'NumMinorLevels'))
+            if minors > 0:
+                listzlevels = listzlevels[::minors+1]
         dictret = {
             'minors': minors,
             'levels': listzlevels,
@@ -459,17 +514,12 @@ class Plot(BaseObject):
         minor_levels = dict['minors']
         listlevels = dict['levels']
         strTempLTvarName = '__opZLevelsVar$' #must start with "__" so that it matches LT_SYS_STR_PREFIX
-        strVarValue = ''
-        for ii, level in enumerate(listlevels):
-            strval = str(level)
-            if ii > 0:
-                strVarValue += '|'
-            strVarValue += strval
-
-        self.layer.DoMethod(self._format_property('cmap.setLevels'), '1') # set Levels by Major
+        strVarValue = '|'.join(str(level) for level in listlevels)
+
+        cmap = self._format_property('cmap.')
+        self.layer.DoMethod(cmap + 'setLevels', '1') # set Levels by Major
         po.LT_set_str(strTempLTvarName, strVarValue)
-        strLT = self._format_property('cmap.setZLevels')
-        self.layer.DoMethod(strLT, f'{strTempLTvarName}, {minor_levels}')
+        self.layer.DoMethod(cmap + 'setZLevels', f'{strTempLTvarName}, {minor_levels}')
         strLT = f'del -v {strTempLTvarName}'
         po.LT_execute(strLT)
         #self.layer.SetNumProp(self._format_property('cmap.zabove'), dict['levelabove'])
@@ -507,7 +557,7 @@ class Plot(BaseObject):
             p = g[0].add_plot(wks,'(0,1)')
             p.symbol_size = 20.5
         """
-        self.layer.SetNumProp(self._format_property('symbol.size'), size)
+        self._set_num('symbol.size', size)
 
     @property
     def symbol_kind(self):
@@ -540,7 +590,7 @@ class Plot(BaseObject):
             p = g[0].add_plot(wks,'(0,1)')
             p.symbol_kind = 2
         """
-        self.layer.SetNumProp(self._format_property('symbol.kind'), shape)
+        self._set_num('symbol.kind', shape)
 
     @property
     def symbol_kindinc(self):
@@ -573,7 +623,7 @@ class Plot(BaseObject):
             p = g[0].add_plot(wks,'(0,1)')
             p.symbol_kindinc = 1
         """
-        self.layer.SetNumProp(self._format_property('symbol.kindinc'), inc)
+        self._set_num('symbol.kindinc', inc)
 
     @property
     def symbol_interior(self):
@@ -606,7 +656,7 @@ class Plot(BaseObject):
             p = g[0].add_plot(wks,'(0,1)')
             p.symbol_interior = 2
         """
-        self.layer.SetNumProp(self._format_property('symbol.interior'), fill)
+        self._set_num('symbol.interior', fill)
 
     @property
     def symbol_sizefactor(self):
@@ -640,7 +690,7 @@ class Plot(BaseObject):
             p.symbol_size=modi_col(1)
             p.symbol_sizefactor = 10
         """
-        self.layer.SetNumProp(self._format_property('symbol.sizefactor'), fac)
+        self._set_num('symbol.sizefactor', fac)
 
     @property
     def transparency(self):
@@ -654,7 +704,7 @@ class Plot(BaseObject):
         """
         set the plot's line or symbol transparency in percent
         """
-        self.layer.SetNumProp(self._format_property('transparency'), t)
+        self._set_num('transparency', t)
 
     def remove(self):
         """
@@ -710,6 +760,7 @@ class GLayer(BaseLayer):
     """
     This class represents an Origin Graph Layer, it holds an instance of a PyOrigin GraphLAyer
     """
+    __slots__ = ()
     def __repr__(self):
         return 'GLayer: ' + self.lt_range()
 
@@ -737,6 +788,32 @@ class GLayer(BaseLayer):
         else:
             self.obj.LT_execute(f'layer -ar{skip}')
 
+    @contextmanager
+    def batch(self):
+        """
+        Collect the numeric style settings of the layer's plots (color, colorinc, symbol_*, transparency)
+        and apply them in a single LabTalk call when the block ends
+
+        Only plots obtained from this GLayer object are collected, others are set immediately.
+        Reading these properties inside the block returns the values from before the block.
+
+        Examples:
+            gl = op.find_graph()[0]
+            with gl.batch():
+                for p in gl.plot_list():
+                    p.color = 'Red'
+                    p.symbol_kind = 2
+                    p.symbol_size = 12
+        """
+        cmds = []
+        _BATCH.append((self.obj, cmds))
+        try:
+            yield self
+        finally:
+            _BATCH.pop()
+            if cmds:
+                self.obj.LT_execute(';'.join(cmds))
+
     def group(self, group=True, begin=-1, end=-1):
         """
         Group/Ungroup data plots
@@ -753,10 +830,13 @@ class GLayer(BaseLayer):
             plot = gl.add_plot('[Book1]1!(A,D:0)', type='l')
             gl.group(True,2,3)
         """
-        script = (f'layer -g{"" if group else "u"} '
-                f'{"" if begin < 0 else begin+1} '
-                f'{"" if not group or end < 0 else end+1}')
-        self.obj.LT_execute(script.rstrip())
+        if not group:
+            script = 'layer -gu' if begin < 0 else f'layer -gu {begin+1}'
+        elif end >= 0:
+            script = f'layer -g {max(begin, 0)+1} {end+1}'
+        else:
+            script = 'layer -g' if begin < 0 else f'layer -g {begin+1}'
+        self.obj.LT_execute(script)
 
     def axis(self, ax):
         """
@@ -783,11 +863,11 @@ class GLayer(BaseLayer):
         Returns:
             New X axis limits
         """
-        return self.axis('x').limits
+        return _axis_limits(self.obj, 'x')
     @xlim.setter
     def xlim(self, limits):
         """save as set_xlim"""
-        return self.set_xlim(limits)
+        _set_axis_limits(self.obj, 'x', limits)
 
     @property
     def ylim(self):
@@ -795,11 +875,11 @@ class GLayer(BaseLayer):
         See Also:
             xlim property getter
         """
-        return self.axis('y').limits
+        return _axis_limits(self.obj, 'y')
     @ylim.setter
     def ylim(self, limits):
         """save as set_xlim"""
-        return self.set_ylim(limits)
+        _set_axis_limits(self.obj, 'y', limits)
 
     @property
     def zlim(self):
@@ -807,11 +887,11 @@ class GLayer(BaseLayer):
         See Also:
             xlim property getter
         """
-        return self.axis('z').limits
+        return _axis_limits(self.obj, 'z')
     @zlim.setter
     def zlim(self, limits):
         """save as set_xlim"""
-        return self.set_zlim(limits)
+        _set_axis_limits(self.obj, 'z', limits)
 
 
     def set_xlim(self, begin=None, end=None, step=None):
@@ -831,7 +911,8 @@ class GLayer(BaseLayer):
             g[0].set_xlim(0, 1)
             g[0].set_xlim(step=0.2)
         """
-        return self.axis('x').set_limits(begin, end, step)
+        _set_axis_limits(self.obj, 'x', begin, end, step)
+        return _axis_limits(self.obj, 'x')
 
     def set_ylim(self, begin=None, end=None, step=None):
         """
@@ -850,7 +931,8 @@ class GLayer(BaseLayer):
             g[0].set_ylim(1, 100, 20)
             g[0].set_ylim(begin=0)
         """
-        return self.axis('y').set_limits(begin, end, step)
+        _set_axis_limits(self.obj, 'y', begin, end, step)
+        return _axis_limits(self.obj, 'y')
 
     def set_zlim(self, begin=None, end=None, step=None):
         """
@@ -869,7 +951,8 @@ class GLayer(BaseLayer):
             g[0].set_zlim(0, 5)
             g[0].set_zlim(step=1)
         """
-        return self.axis('z').set_limits(begin, end, step)
+        _set_axis_limits(self.obj, 'z', begin, end, step)
+        return _axis_limits(self.obj, 'z')
 
 
     @property
@@ -897,13 +980,12 @@ class GLayer(BaseLayer):
                 ['linear', 'log10', 'probability', 'probit', 'reciprocal', 'offset_reciprocal', 'logit', 'ln', 'log2']
 
         Returns:
-            New scale type of x axis
+            None
 
         Examples:
             lay.xscale = 'log10'
         """
         self.axis('x').scale = scaletype
-        return self.xscale
 
     @property
     def yscale(self):
@@ -920,7 +1002,6 @@ class GLayer(BaseLayer):
             xscale property setter
         """
         self.axis('y').scale = scaletype
-        return self.yscale
 
     @property
     def zscale(self):
@@ -937,7 +1018,6 @@ class GLayer(BaseLayer):
             xscale property setter
         """
         self.axis('z').scale = scaletype
-        return self.axis('z').scale
 
     def label(self, name):
         """
@@ -974,7 +1054,10 @@ class GLayer(BaseLayer):
         if isinstance(label, Label):
             label.remove()
         elif isinstance(label, str):
-            self.remove_label(self.label(label))
+            lb = self.obj.GraphObjects(label)
+            if lb is None:
+                raise ValueError(f'label "{label}" not found in layer.')
+            lb.Destroy()
         else:
             raise TypeError('"label"" must ba an instance of either str or Label.')
 
@@ -992,10 +1075,9 @@ class GLayer(BaseLayer):
             items = lay.plot_list()
             item = lay.plot_list()[0]
         """
-        if isinstance(obj, Label):
-            self.remove_label(obj)
-        elif isinstance(obj, Plot):
-            self.remove_plot(obj)
+        #both wrappers destroy their own Origin object
+        if isinstance(obj, (Plot, Label)):
+            obj.remove()
 
     def plot_list(self):
         """
@@ -1010,10 +1092,7 @@ class GLayer(BaseLayer):
             items = lay.plot_list()
             item = lay.plot_list()[0]
         """
-        plist = []
-        for dp in self.obj.DataPlots:
-            plist.append(Plot(dp, self.obj))
-        return plist
+        return [Plot(dp, self.obj) for dp in self.obj.DataPlots]
 
     def remove_plot(self, plot):
         """
@@ -1031,7 +1110,13 @@ class GLayer(BaseLayer):
         if isinstance(plot, Plot):
             plot.remove()
         elif isinstance(plot, int):
-            self.remove_plot(self.plot_list()[plot])
+            dps = self.obj.DataPlots
+            nplots = dps.GetCount()
+            if plot < 0:
+                plot += nplots
+            if not 0 <= plot < nplots:
+                raise IndexError('plot index out of range')
+            dps(plot).Destroy()
         else:
             raise TypeError('"plot"" must ba an instance of either Plot or int.')
     @staticmethod
@@ -1039,24 +1124,8 @@ class GLayer(BaseLayer):
         if isinstance(type, int):
             return type
         if len(type) > 1:
-            plttypes = {
-                "line":'l',
-                "scatter":'s',
-                "linesymbol":'y',
-                "column":'c',
-                "contour":'contour',
-                }
-            type = plttypes[type]
-
-        plottypes = {
-            "?": 230,
-            "l": 200,
-            "s": 201,
-            "y": 202,
-            "c": 203,
-            "contour": 226,
-            }
-        return plottypes[type]
+            type = _PLOT_TYPE_SHORT[type]
+        return _PLOT_TYPE_CODES[type]
 
     def _add_plot(self, ranges, type):
         if isinstance(ranges, str):
@@ -1107,20 +1176,22 @@ class GLayer(BaseLayer):
             dp = self._add_plot(obj, type)
         else:
             wks = obj
-            colx = self._to_lt_str(colx, wks)
-            coly = self._to_lt_str(coly, wks)
+            #only resolve the columns that end up in the range, names cost a lookup in Origin
             colz = self._to_lt_str(colz, wks)
-            colyerr = self._to_lt_str(colyerr, wks)
-            colxerr = self._to_lt_str(colxerr, wks)
-            if colz:
-                if coly:
+            coly = self._to_lt_str(coly, wks)
+            if colz and not coly:
+                colspec = colz
+            else:
+                colx = self._to_lt_str(colx, wks)
+                if colz:
                     colspec = f'({colx}, {coly}, {colz})'
                 else:
-                    colspec = colz
-            elif colyerr or colxerr:
-                colspec = f'({colx}, {coly}, {colyerr}, {colxerr})'
-            else:
-                colspec = f'({colx}, {coly})'
+                    colyerr = self._to_lt_str(colyerr, wks)
+                    colxerr = self._to_lt_str(colxerr, wks)
+                    if colyerr or colxerr:
+                        colspec = f'({colx}, {coly}, {colyerr}, {colxerr})'
+                    else:
+                        colspec = f'({colx}, {coly})'
             srange = wks.lt_range(False)
             dp = self._add_plot(f'{srange}!{colspec}', type)
         if dp is None:
@@ -1156,13 +1227,13 @@ class GLayer(BaseLayer):
         moname = mo.DatasetName
         x = 0 if x < 0 else x + 1
         y = 0 if y < 0 else y + 1
-        self.obj.LT_execute(f'set {moname} -zx {x};set {moname} -zy {y};')
+        cmd = f'set {moname} -zx {x};set {moname} -zy {y};'
 
-        colormapname = ''
         if cm >= 0:
             mcm = ms.obj[cm]
             colormapname = mcm.DatasetName
-            self.obj.LT_execute(f'set {moname} -b3c {colormapname};')
+            cmd += f'set {moname} -b3c {colormapname};'
+        self.obj.LT_execute(cmd)
 
         return plotadded
 
@@ -1171,6 +1242,7 @@ class GPage(BasePage):
     """
     This class represent an Origin Graph Page, it holds an instance of a PyOrigin GraphPage
     """
+    __slots__ = ()
     def __repr__(self):
         return 'GPage: ' + self.obj.GetName()
 
@@ -1216,22 +1288,18 @@ class GPage(BasePage):
                 path = path0#d:\\test\\test, need to restore
                 path = last_backslash(path,'t')#expgraph has trouble with path ending with \\
                 fname=''
-        exp = 'expgraph -sw'#silent warning messages
-        if type=='auto':
-            exp += ' -t <book>'
+        if type == 'auto' and not path and replace and width <= 0:
+            exp = _EXPGRAPH_AUTO
         else:
-            exp += ' type:=' + str(type)
-
-        if fname:
-            exp += f' filename:="{fname}"'
-        if replace:
-            exp += ' overwrite:=replace'
-        else:
-            exp += ' overwrite:=skip'
-        if width > 0:
-            exp += f' tr1.Unit:=2 tr1.Width:={width}'
-        if path:
-            exp += f' path:="{path}"'
+            parts = [_EXPGRAPH, ' -t <book>' if type == 'auto' else f' type:={type}']
+            if fname:
+                parts.append(f' filename:="{fname}"')
+            parts.append(' overwrite:=replace' if replace else ' overwrite:=skip')
+            if width > 0:
+                parts.append(f' tr1.Unit:=2 tr1.Width:={width}')
+            if path:
+                parts.append(f' path:="{path}"')
+            exp = ''.join(parts)
         self.obj.LT_execute(exp)
         return po.LT_get_str('__LASTEXP')
 
@@ -1271,10 +1339,10 @@ class GPage(BasePage):
         '''
         if fmt.upper() == 'OLE':
             COPY_PAGE_RATIO = 'System.CopyPage.Ratio'
-            oldRatio = po.LT_evaluate(COPY_PAGE_RATIO)
-            po.LT_set_var(COPY_PAGE_RATIO, ratio)
+            #keep the old ratio in LabTalk, so saving and setting it is one call
+            po.LT_execute(f'__PYCPRATIO={COPY_PAGE_RATIO};{COPY_PAGE_RATIO}={ratio}')
             self.method_int('copy', 'OLE')
-            po.LT_set_var(COPY_PAGE_RATIO, oldRatio)
+            po.LT_execute(f'{COPY_PAGE_RATIO}=__PYCPRATIO;del -v __PYCPRATIO')
         else:
             self.lt_exec(f'copyimg igp:={self.name} type:={fmt.lower()} tb:={1 if tb else 0} res:={res} ratio:={ratio}')
 
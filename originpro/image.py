@@ -4,24 +4,23 @@ A package for interacting with Origin software via Python.
 Copyright (c) 2021 OriginLab Corporation
 """
 # pylint: disable=C0103,C0301
-try:
-    from .config import np, orgdtype_to_npdtype
-except ImportError:
-    pass
 from .base import BasePage
 from .graph import GLayer
+from . import config
 from .config import po
 
 class IPage(BasePage):
     """
     This class represents an Origin Image Window, it holds an instance of a PyOrigin ImagePage
     """
+    __slots__ = ()
     def __repr__(self):
         return 'IPage: ' + self.obj.GetName()
 
     def from_np(self, arr, dstack=False):
         """
         Set an Image page data from a multi-dimensional numpy array.
+        A non-contiguous array (a slice or transpose view) is copied once here into a contiguous one.
 
         Parameters:
             arr (numpy array):
@@ -30,7 +29,14 @@ class IPage(BasePage):
             None
 
         Examples:
+
         """
+        np = config.np
+        if dstack and arr.ndim == 3:
+            #put frames first while making it contiguous, so Origin does not need another transpose pass
+            arr = np.moveaxis(arr, -1, 0)
+            dstack = False
+        arr = np.ascontiguousarray(arr)
         options = po.IMGSETDATAOPTS_FRAMESDIMENSION_IS_LAST if dstack else 0
         if not self.obj.SetData(arr, options):
             raise ValueError('ImagePage set data error')
@@ -47,7 +53,15 @@ class IPage(BasePage):
         Examples:
         """
         retlist, ndf = self.obj.GetData()
-        return np.asarray(retlist, orgdtype_to_npdtype[ndf])
+        return config.np.asarray(retlist, config.orgdtype_to_npdtype_obj[ndf])
+
+    def __array__(self, dtype=None, copy=None):
+        """numpy array protocol, so np.asarray(iw) is the same as iw.to_np()"""
+        if copy is False:
+            raise ValueError('image data is always copied out of Origin, copy=False is not possible')
+        #to_np already returns a new array, so copy=True needs nothing more
+        arr = self.to_np()
+        return arr if dtype is None else arr.astype(dtype, copy=False)
 
     def to_np2d(self, frame):
         """
@@ -64,7 +78,7 @@ class IPage(BasePage):
             im2=iw.to_np2d(1)
         """
         retlist, ndf = self.obj.GetData(frame)
-        return np.asarray(retlist, orgdtype_to_npdtype[ndf])
+        return config.np.asarray(retlist, config.orgdtype_to_npdtype_obj[ndf])
 
     def from_np2d(self, arr, frame):
         """
@@ -83,7 +97,7 @@ class IPage(BasePage):
             im2*=10
             iw.from_np2d(im2,2)
         """
-        return self.obj.SetData(arr, 0, frame)
+        return self.obj.SetData(config.np.ascontiguousarray(arr), 0, frame)
 
 
     def from_file(self, fname):
@@ -4,17 +4,22 @@ A package for interacting with Origin software via Python.
 Copyright (c) 2020 OriginLab Corporation
 """
 # pylint: disable=C0301,C0103,R0914,R0912
-try:
-    from .config import np, npdtype_to_orgdtype, orgdtype_to_npdtype
-except ImportError:
-    pass
+from itertools import islice
+from . import config
 from .config import oext
 from .base import DSheet, DBook
 
+#MatrixObject label getter/setter method names by label row character
+_GET_LABEL = {'L': 'GetLongName', 'C': 'GetComments'}
+_SET_LABEL = {'L': 'SetLongName', 'C': 'SetComments'}
+#LabTalk label property names for the sheet X/Y labels
+_LT_LABEL_NAMES = {'L': 'LongName', 'U': 'Units', 'C': 'Comments'}
+
 class MSheet(DSheet):
     """
     This class represents an Origin Matrix Sheet, it holds an instance of a PyOrigin MatrixSheet.
     """
+    __slots__ = ()
     def get_book(self):
         """
         Returns parent book of sheet.
@@ -53,7 +58,6 @@ class MSheet(DSheet):
         print(ms.depth)
         """
         self.obj.SetNumMats(z)
-        return self.obj.GetNumMats()
 
     def from_np(self, arr, dstack=False, mv=None):
         """
@@ -72,8 +76,8 @@ class MSheet(DSheet):
             ms.from_np(arr)
         """
         is_seq = isinstance(arr, (list, tuple))
-        fmt = arr[0].dtype.type if is_seq else arr.dtype.type
-        dfmt = npdtype_to_orgdtype.get(fmt)
+        fmt = arr[0].dtype.num if is_seq else arr.dtype.num
+        dfmt = config.npdtype_num_to_orgdtype.get(fmt)
         if dfmt is None:
             raise ValueError('Array Data Type not supported')
         if is_seq:
@@ -102,18 +106,22 @@ class MSheet(DSheet):
                 rows, cols, depth = arr.shape
             else:
                 depth, rows, cols = arr.shape
-        self.depth = 1
+        self.depth = depth
         self.shape = rows, cols
-        self.obj[0].DataFormat = dfmt
+        mos = self.obj.MatrixObjects
+        mos(0).DataFormat = dfmt
+        #the format is for the whole sheet, but if it did not reach the other objects, set them one by one
+        fix_fmt = depth > 1 and mos(depth - 1).DataFormat != dfmt
         if mv is not None:
             self.set_float('col1.missing', mv)
-        self.depth = depth
-        for i in range(depth):
-            mo = self.obj[i]
-            if dstack:
-                mo.SetData(arr[:,:,i])
-            else:
-                mo.SetData(arr[i])
+        planes = (arr[:,:,i] for i in range(depth)) if dstack else arr
+        #hand Origin contiguous planes of the sheet's type, this is a no-op for planes that already are
+        dtype = arr[0].dtype if is_seq else arr.dtype
+        ascontiguous = config.np.ascontiguousarray
+        for mo, plane in zip(mos, planes):
+            if fix_fmt:
+                mo.DataFormat = dfmt
+            mo.SetData(ascontiguous(plane, dtype))
 
     def to_np2d(self, index=0, order='C'):
         """
@@ -132,8 +140,13 @@ class MSheet(DSheet):
             arr = ms.to_np2d(0, 'R')
             print(arr)
         """
+        np = config.np
         mo = self.obj.MatrixObjects(index)
-        return np.asarray(mo.GetData(), orgdtype_to_npdtype[mo.DataFormat], order)
+        data = mo.GetData()
+        #an ndarray from GetData already has the matrix type, asarray only copies it if the order differs
+        if isinstance(data, np.ndarray):
+            return np.asarray(data, order=order)
+        return np.asarray(data, config.orgdtype_to_npdtype_obj[mo.DataFormat], order)
 
     def from_np2d(self, arr, index=0):
         """
@@ -188,12 +201,23 @@ class MSheet(DSheet):
             mc.from_np(cc)
             mc.show_thumbnails()
         """
-        m2d = []
-        for mo in self.obj.MatrixObjects:
-            m2d.append(np.asarray(mo.GetData(), orgdtype_to_npdtype[mo.DataFormat], order))
-        if dstack:
-            return np.dstack(m2d)
-        return np.array(m2d)
+        np = config.np
+        depth = self.depth
+        arr = None
+        #fill each plane into the final array, instead of stacking a list of planes with another copy
+        for i, mo in enumerate(self.obj.MatrixObjects):
+            plane = np.asarray(mo.GetData(), config.orgdtype_to_npdtype_obj[mo.DataFormat])
+            if arr is None:
+                rows, cols = plane.shape
+                arr = np.empty((rows, cols, depth) if dstack else (depth, rows, cols), plane.dtype, 'F' if order == 'F' else 'C')
+            elif plane.dtype != arr.dtype:
+                #the objects do not always share one format, promote as stacking the planes would
+                arr = arr.astype(np.result_type(arr, plane))
+            if dstack:
+                arr[:, :, i] = plane
+            else:
+                arr[i] = plane
+        return np.array([]) if arr is None else arr
 
     def show_image(self, show = True):
         """
@@ -293,21 +317,11 @@ class MSheet(DSheet):
     def _getlabel(mo, type_ = 'L'):
         if len(type_) > 1:
             raise ValueError('Invalid label row character')
-        dd = {
-            'L': mo.GetLongName,
-            'C': mo.GetComments,
-            }
-        func = dd[type_]
-        return func()
+        return getattr(mo, _GET_LABEL[type_])()
 
     @staticmethod
     def _get_LT_label_name(type_):
-        dd = {
-            'L': 'LongName',
-            'U': 'Units',
-            'C': 'Comments',
-            }
-        return dd[type_]
+        return _LT_LABEL_NAMES[type_]
 
     def get_label(self, index, type_ = 'L'):
         """
@@ -346,18 +360,16 @@ class MSheet(DSheet):
             ms=op.find_sheet('M')
             comments = ms.get_labels('C')
         '''
-        return [self._getlabel(mo, type_) for mo in self.obj]
+        if len(type_) > 1:
+            raise ValueError('Invalid label row character')
+        getter = _GET_LABEL[type_]
+        return [getattr(mo, getter)() for mo in self.obj]
 
     @staticmethod
     def _setlabel(mo, val, type_ = 'L'):
         if len(type_) > 1:
             raise ValueError('Invalid label row character')
-        dd = {
-            'L': mo.SetLongName,
-            'C': mo.SetComments,
-            }
-        func = dd[type_]
-        return func(val)
+        return getattr(mo, _SET_LABEL[type_])(val)
 
     def set_label(self, index, val, type_ = 'L'):
         """
@@ -393,13 +405,18 @@ class MSheet(DSheet):
             ms=op.find_sheet('M')
             ms.set_labels(['long name for col A', 'long name for col B'], 'L')
         """
-        for ii, val in enumerate(labels[:self.depth]):
-            self.set_label(ii + offset, val, type_)
+        if len(type_) > 1:
+            raise ValueError('Invalid label row character')
+        setter = _SET_LABEL[type_]
+        #walk the matrix objects together with the labels, zip stops at whichever runs out first
+        for mo, val in zip(islice(self.obj, offset, None), labels):
+            getattr(mo, setter)(val)
 
 class MBook(DBook):
     """
     This class represents an Origin Matrix Book, it holds an instance of a PyOrigin MatrixPage.
     """
+    __slots__ = ()
     def _sheet(self, obj):
         return MSheet(obj)
 
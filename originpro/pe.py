@@ -8,7 +8,7 @@ from typing import Union
 from .config import po, oext
 from .utils import _LTTMPOUTSTR, active_obj
 from .base import BaseObject
-from .project import _make_page
+from .project import _make_page, _PAGE_CLS
 from .worksheet import WBook
 from .matrix import MBook
 from .graph import GPage
@@ -24,8 +24,7 @@ def search(name='', kind=0):
     Returns:
         Current path if page/folder is empty, or path where page/folder is located
     """
-    with _LTTMPOUTSTR() as pp:
-        po.LT_execute(f'pe_path page:="{name}" path:={pp.name}$ type:={kind};')
+    with _LTTMPOUTSTR(labtalk=lambda out: f'pe_path page:="{name}" path:={out}$ type:={kind};') as pp:
         return pp.get()
 
 def cd(path=None):
@@ -37,6 +36,7 @@ def cd(path=None):
         Current path
     """
     if path is not None:
+        #separate from the path query, a failed pe_cd would skip the rest of a combined statement
         po.LT_execute(f'pe_cd path:="{path}"')
     return search()
 
@@ -49,8 +49,7 @@ def mkdir(path, chk=False):
     Returns:
         Path created
     """
-    with _LTTMPOUTSTR() as pp:
-        po.LT_execute(f'pe_mkdir folder:="{path}" chk:={int(chk)} path:={pp.name}$;')
+    with _LTTMPOUTSTR(labtalk=lambda out: f'pe_mkdir folder:="{path}" chk:={int(chk)} path:={out}$;') as pp:
         return pp.get()
 
 def move(name, path):
@@ -66,6 +65,7 @@ def move(name, path):
 
 class Folder(BaseObject):
     ''' Origin Folder in Project Explorer'''
+    __slots__ = ()
     def __repr__(self):
         return self.path
 
@@ -87,6 +87,8 @@ class Folder(BaseObject):
             for wks in wb:
                 print(f'Worksheet {wks.lt_range()} has {wks.rows} rows')
         """
+        if type_ and type_ not in _PAGE_CLS:
+            return#no page can match, skip querying every page's type
         for page in self.obj.PageBases():
             pg = _make_page(page, type_)
             if pg is not None:
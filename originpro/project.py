@@ -4,6 +4,8 @@ A package for interacting with Origin software via Python.
 Copyright (c) 2020 OriginLab Corporation
 """
 # pylint: disable=C0301,C0103,W0622
+from functools import lru_cache
+from itertools import islice
 from typing import Union, List
 from .config import po, oext
 from .utils import get_file_ext, active_obj, path, origin_class
@@ -28,32 +30,59 @@ _LAYER_CLS = {
     _MBOOK_TYPE: MSheet,
     _GPAGE_TYPE: GLayer,
 }
-_PAGE_TYPES = {
-    _WBOOK_TYPE: po.OPT_WORKSHEET if oext else po.PGTYPE_WKS,
-    _MBOOK_TYPE: po.OPT_MATRIX if oext else po.PGTYPE_MATRIX,
-    _GPAGE_TYPE: po.OPT_GRAPH if oext else po.PGTYPE_GRAPH,
+if oext:
+    _PAGE_TYPES = {
+        _WBOOK_TYPE: po.OPT_WORKSHEET,
+        _MBOOK_TYPE: po.OPT_MATRIX,
+        _GPAGE_TYPE: po.OPT_GRAPH,
+        _IPAGE_TYPE: getattr(po, 'OPT_IMAGE', None),
+    }
+else:
+    _PAGE_TYPES = {
+        _WBOOK_TYPE: po.PGTYPE_WKS,
+        _MBOOK_TYPE: po.PGTYPE_MATRIX,
+        _GPAGE_TYPE: po.PGTYPE_GRAPH,
+        _IPAGE_TYPE: getattr(po, 'PGTYPE_IMAGE', None),
+    }
+#GetType() of a page from po.Pages or a folder, compared against in find_graph/find_image/graph_list
+_OPT_GRAPH = po.OPT_GRAPH
+_OPT_IMAGE = getattr(po, 'OPT_IMAGE', None)
+if _PAGE_TYPES[_IPAGE_TYPE] is None:
+    del _PAGE_TYPES[_IPAGE_TYPE]
+#PyOrigin page type to wrapper class, so a page is classified with a single lookup
+_PO_PAGE_CLS = {v: _PAGE_CLS[k] for k, v in _PAGE_TYPES.items()}
+#names rather than the functions, so nothing holds on to the Origin application object
+_FIND_SHEET = {
+    _WBOOK_TYPE: 'FindWorksheet',
+    _MBOOK_TYPE: 'FindMatrixSheet',
+}
+_GET_PAGES = {
+    _WBOOK_TYPE: 'GetWorksheetPages',
+    _MBOOK_TYPE: 'GetMatrixPages',
+    _GPAGE_TYPE: 'GetGraphPages',
+    _IPAGE_TYPE: 'GetImagePages',
 }
-try:
-    _PAGE_TYPES[_IPAGE_TYPE] = po.OPT_IMAGE if oext else po.PGTYPE_IMAGE
-except AttributeError:
-    pass
-_PO_PAGE_TYPES = {v:k for k, v in _PAGE_TYPES.items()}
 def _get_from_type(items, type):
-    item = items.get(type)
-    if item is None:
-        raise ValueError("Book/Sheet type can only be 'w'(Worksheet) or 'm'(Matrix)")
-    return item
-
+    try:
+        return items[type]
+    except KeyError:
+        raise ValueError("Book/Sheet type can only be 'w'(Worksheet) or 'm'(Matrix)") from None
+
+_EXT_TO_TYPE = {
+    '.ogw': _WBOOK_TYPE,
+    '.ogwu': _WBOOK_TYPE,
+    '.ogm': _MBOOK_TYPE,
+    '.ogmu': _MBOOK_TYPE,
+    '.ogg': _GPAGE_TYPE,
+    '.oggu': _GPAGE_TYPE,
+}
 def _type_from_ext(ext):
-    ext = ext.lower()
-    if ext in ['.ogw', '.ogwu']:
-        return _WBOOK_TYPE
-    if ext in ['.ogm', '.ogmu']:
-        return _MBOOK_TYPE
-    if ext in ['.ogg', '.oggu']:
-        return _GPAGE_TYPE
-    raise ValueError("Invalid file extension")
+    try:
+        return _EXT_TO_TYPE[ext.lower()]
+    except KeyError:
+        raise ValueError("Invalid file extension") from None
 
+@lru_cache(maxsize=256)
 def _is_good_sn(name):
     nn = len(name)
     if nn == 0 or nn > 21:
@@ -64,19 +93,28 @@ def _is_good_sn(name):
     return name.isidentifier()
 
 #return PyOrigin Page
+_CREATE_NO_DEFAULT_TEMPLATE = 0x00080000
+#CreatePage options keyed by hidden
+_CREATE_OPT = {
+    True: po.CREATEOPT_HIDDEN | _CREATE_NO_DEFAULT_TEMPLATE,
+    False: po.CREATEOPT_VISIBLE | _CREATE_NO_DEFAULT_TEMPLATE,
+}
+
+@lru_cache(maxsize=32)
+def _template_name(template):
+    if template is None:
+        return ''
+    if not template:
+        return 'Origin'
+    ext = get_file_ext(template).lower()
+    if ext and not ext.startswith('.ot'):
+        raise ValueError('extension specfiied is not a template file')
+    return template
+
 def _new_page(type, lname, template, hidden):
     type2 = _get_from_type(_PAGE_TYPES, type)
-    if template is None:
-        template = ''
-    elif not template:
-        template = 'Origin'
-    else:
-        ext = get_file_ext(template)
-        if len(ext) > 0 and ext[1:3] != 'ot':
-            raise ValueError('extension specfiied is not a template file')
-    visible = po.CREATEOPT_HIDDEN if hidden else po.CREATEOPT_VISIBLE
-    CREATE_NO_DEFAULT_TEMPLATE = 0x00080000
-    visible |= CREATE_NO_DEFAULT_TEMPLATE
+    template = _template_name(template)
+    visible = _CREATE_OPT[bool(hidden)]
     sname = lname if _is_good_sn(lname) else ''
     book = po.CreatePage(type2, sname, template, visible)
     if oext:
@@ -86,21 +124,20 @@ def _new_page(type, lname, template, hidden):
             book.SetLongName(lname)
     return book
 
-def _new_page2(type, lname, template, hidden):
-    cls = _get_from_type(_PAGE_CLS, type)
+def _new_page2(type, lname, template, hidden, cls=None):
+    if cls is None:
+        cls = _get_from_type(_PAGE_CLS, type)
     page = _new_page(type, lname, template, hidden)
     return cls(page) if page else None
 
 def _make_page(page, type_=''):
-    try:
-        ptype = _PO_PAGE_TYPES[page.GetType()]
-        if not type_ or type_ == ptype:
-            if isinstance(page, origin_class('PageBase')):
-                page = po.Pages(page.GetName())
-            return _PAGE_CLS[ptype](page)
-    except KeyError:
-        pass
-    return None
+    potype = page.GetType()
+    cls = _PO_PAGE_CLS.get(potype)
+    if cls is None or (type_ and _PAGE_TYPES.get(type_) != potype):
+        return None
+    if isinstance(page, origin_class('PageBase')):
+        page = po.Pages(page.GetName())
+    return cls(page)
 
 def new_book(type=_WBOOK_TYPE, lname='', template='', hidden=False) -> Union[WBook, MBook]:
     """
@@ -142,7 +179,7 @@ def new_graph(lname='', template='', hidden=False) -> GPage:
         g2 = op.new_graph('My Graph')
         g3 = op.new_graph(template=op.path('e') + '3Ys_Y-Y-Y.otp')
     """
-    return _new_page2(_GPAGE_TYPE, lname, template, hidden)
+    return _new_page2(_GPAGE_TYPE, lname, template, hidden, GPage)
 
 def new_image(lname='', hidden=False) -> IPage:
     """
@@ -155,7 +192,7 @@ def new_image(lname='', hidden=False) -> IPage:
     Examples:
         im = op.new_image()
     """
-    return _new_page2(_IPAGE_TYPE, lname, None, hidden)
+    return _new_page2(_IPAGE_TYPE, lname, None, hidden, IPage)
 
 def new_sheet(type=_WBOOK_TYPE, lname='', template='', hidden=False) -> Union[WSheet, MSheet]:
     """
@@ -175,30 +212,21 @@ def new_sheet(type=_WBOOK_TYPE, lname='', template='', hidden=False) -> Union[WS
         wks2 = op.new_sheet('w', 'My Template.otwu')
         mxs = op.new_sheet('m', hidden=True)
     """
+    cls = _get_from_type(_LAYER_CLS, type)
     book = _new_page(type, lname, template, hidden)
-    return _LAYER_CLS[type](book.Layers(0)) if book else None
+    return cls(book.Layers(0)) if book else None
 
 def _get_item(coll, index):
     """WorksheetPages etc has no index, and no slice"""
-    i=0
-    for x in coll:
-        if i==index:
-            return x
-        i+=1
-    return None
+    if index < 0:
+        return None
+    return next(islice(coll, index, None), None)
 
 def _get_page(type, index):
-    if type ==_WBOOK_TYPE:
-        fnGetPages = po.GetWorksheetPages
-    elif type ==_MBOOK_TYPE:
-        fnGetPages = po.GetMatrixPages
-    elif type ==_GPAGE_TYPE:
-        fnGetPages = po.GetGraphPages
-    elif type ==_IPAGE_TYPE:
-        fnGetPages = po.GetImagePages
-    else:
+    fname = _GET_PAGES.get(type)
+    if fname is None:
         raise ValueError('Invalid page type')
-    return _get_item(fnGetPages(), index)
+    return _get_item(getattr(po, fname)(), index)
 
 def _get_sheet(index, type):
     bk = _get_page(type, index)
@@ -237,11 +265,7 @@ def find_sheet(type=_WBOOK_TYPE, ref='') -> Union[WSheet, MSheet]:
     if isinstance(ref, int):
         ms = _get_sheet(ref, type)
     else:
-        find = _get_from_type({
-            _WBOOK_TYPE: po.FindWorksheet,
-            _MBOOK_TYPE: po.FindMatrixSheet,
-        }, type)
-        ms= find(ref)
+        ms = getattr(po, _get_from_type(_FIND_SHEET, type))(ref)
     return _LAYER_CLS[type](ms) if ms else None
 
 def find_book(type=_WBOOK_TYPE, name='') -> Union[WBook, MBook]:
@@ -264,12 +288,13 @@ def find_book(type=_WBOOK_TYPE, name='') -> Union[WBook, MBook]:
 
 def _find_page(name, typestr, type_, pagecls):
     if isinstance(name, int):
+        #the typed page collection only holds pages of this type
         page = _get_page(typestr, name)
+        return pagecls(page) if page else None
+    if name:
+        page = po.Pages(name)
     else:
-        if name:
-            page = po.Pages(name)
-        else:
-            page = active_obj('Page')
+        page = active_obj('Page')
 
     if page is None or page.GetType() != type_:
         return None
@@ -290,7 +315,7 @@ def find_graph(name='') -> GPage:
         g = op.find_graph('Graph2')
         glayer=op.find_graph[0]
     """
-    return _find_page(name, _GPAGE_TYPE, po.OPT_GRAPH, GPage)
+    return _find_page(name, _GPAGE_TYPE, _OPT_GRAPH, GPage)
 
 def find_image(name='') -> IPage:
     """
@@ -311,7 +336,7 @@ def find_image(name='') -> IPage:
         dataUpsideDown = np.flip(data, 1)
         im.from_np(dataUpsideDown)
     """
-    return _find_page(name, _IPAGE_TYPE, po.OPT_IMAGE, IPage)
+    return _find_page(name, _IPAGE_TYPE, _OPT_IMAGE, IPage)
 
 
 def load_book(fname) -> Union[WBook, MBook]:
@@ -352,27 +377,19 @@ def graph_list(select='f', inc_embed=False) -> List[GPage]:
     """
     if select not in ['f', 'p', 'o']:
         raise ValueError("select 'f'(folder) 'p'(project) 'o'(open in folder) only")
-    glist=[]
     if select in ['f', 'o']:
         if inc_embed:
             raise ValueError("inc_embed only if select 'p'.")
 
         Folder = active_obj('Folder')
-        for page in Folder.PageBases():
-            if not inc_embed and page.GetNumProp('isEmbedded'):
-                continue
-            if select == 'o' and not BasePage(page).is_open():
-                continue
-            if page.GetType() == po.OPT_GRAPH:
-                glist.append(GPage(page))
-    else:
-        for page in po.GraphPages:
-            if not inc_embed and page.GetNumProp('isEmbedded'):
-                continue
-
-            glist.append(GPage(page))
-
-    return glist
+        open_only = select == 'o'
+        #the type check is the cheapest, so reject other pages before querying them further
+        return [GPage(page) for page in Folder.PageBases()
+                if page.GetType() == _OPT_GRAPH and not page.GetNumProp('isEmbedded')
+                and (not open_only or BasePage(page).is_open())]
+    if inc_embed:
+        return [GPage(page) for page in po.GraphPages]
+    return [GPage(page) for page in po.GraphPages if not page.GetNumProp('isEmbedded')]
 
 def pages(type_='') -> Union[WBook, MBook, GPage, IPage]:
     """
@@ -382,13 +399,15 @@ def pages(type_='') -> Union[WBook, MBook, GPage, IPage]:
     Returns:
         Page Objects
     """
+    if type_:
+        want = _PAGE_TYPES.get(type_)
+        classes = {want: _PO_PAGE_CLS[want]} if want is not None else {}
+    else:
+        classes = _PO_PAGE_CLS
     for page in po.GetPages():
-        try:
-            ptype = _PO_PAGE_TYPES[page.GetType()]
-        except KeyError:
-            continue
-        if not type_ or type_ == ptype:
-            yield _PAGE_CLS[ptype](page)
+        cls = classes.get(page.GetType())
+        if cls is not None:
+            yield cls(page)
 
 def open(file, readonly=False, asksave=False):
     r"""
@@ -424,10 +443,7 @@ def new(asksave=False):
         op.new()
         op.new(True)
     """
-    if not asksave:
-        po.LT_execute('doc -s')
-
-    po.LT_execute('doc -nt')
+    po.LT_execute('doc -nt' if asksave else 'doc -s;doc -nt')
 
 def save(file=''):
     R"""
@@ -5,11 +5,31 @@ Copyright (c) 2020 OriginLab Corporation
 """
 # pylint: disable=C0103,W0622,W0621
 import os
+from copy import deepcopy
+from functools import lru_cache
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape as _xml_escape
 from .config import po, oext
+try:
+    from lxml import etree as _lxml
+    _LXML_PARSER = _lxml.XMLParser(remove_comments=True, remove_pis=True)
+except ImportError:
+    _lxml = None
 
 PATHSEP = os.path.sep
 
+def _parse_xml(xml):
+    """
+    parse xml str with lxml if installed, otherwise with ElementTree.
+    Only for trees that are consumed internally, as lxml elements cannot be mixed with ElementTree ones
+    """
+    if _lxml is not None:
+        try:
+            return _lxml.fromstring(xml, _LXML_PARSER)
+        except ValueError:#str with encoding declaration
+            pass
+    return ET.fromstring(xml)
+
 def lt_float(formula):
     """
     get the result of a LabTalk expression
@@ -55,6 +75,11 @@ def get_lt_str(vname):
     """
     return po.LT_get_str(vname)
 
+@lru_cache(maxsize=32)
+def _app_lt_str(vname):
+    """get_lt_str for %@ paths of the Origin installation, which do not change while attached"""
+    return get_lt_str(vname)
+
 
 def set_lt_str(vname, value):
     """
@@ -108,13 +133,26 @@ def set_lt_var(name, value):
     """
     po.LT_set_var(name, value)
 
+#clear functions of caches kept by other modules, which this module cannot import
+_APP_CACHE_CLEARS = []
+
+def _clear_app_caches():
+    'forget values cached from the Origin instance'
+    _app_lt_str.cache_clear()
+    _lt_color_int.cache_clear()
+    _evaluate_FDF.cache_clear()
+    for clear in _APP_CACHE_CLEARS:
+        clear()
+
 def attach():
     'Attach to exising Origin instance'
+    _clear_app_caches()
     if oext:
         po.Attach()
 
 def detach():
     'Detach Origin instance'
+    _clear_app_caches()
     if oext:
         po.Detach()
 
@@ -122,6 +160,7 @@ def exit():
     """
     exit the application
     """
+    _clear_app_caches()
     if oext:
         po.Exit()
     else:
@@ -141,6 +180,11 @@ def set_show(show = True):
     val = 100 if show else 0
     set_lt_var("@VIS", val)
 
+@lru_cache(maxsize=1024)
+def _lt_color_int(formula):
+    """lt_int for the color and modifier functions, which always return the same value for the same arguments"""
+    return lt_int(formula)
+
 def ocolor(rgb):
     """
     convert color to Origin's internal OColor
@@ -181,11 +225,11 @@ def ocolor(rgb):
         (int) OColor
     """
     if isinstance(rgb, str):
-        orgb = lt_int(f'color({rgb})')
+        orgb = _lt_color_int(f'color({rgb})')
     elif isinstance(rgb, int):
         orgb = rgb
     elif isinstance(rgb, (list, tuple)):
-        orgb = lt_int(f'color({int(rgb[0])}, {rgb[1]}, {rgb[2]})')
+        orgb = _lt_color_int(f'color({int(rgb[0])}, {rgb[1]}, {rgb[2]})')
     else:
         raise ValueError(f'the color value of {rgb} cannot be recognized.')
 
@@ -200,9 +244,10 @@ def to_rgb(orgb):
     Returns:
         (tuple) r,g,b
     """
-    rgb = lt_int(f'ocolor2rgb({orgb})')
-    return int(rgb%256), int(rgb//256%256), int(rgb//256//256%256)
+    rgb = _lt_color_int(f'ocolor2rgb({orgb})')
+    return rgb & 0xFF, rgb >> 8 & 0xFF, rgb >> 16 & 0xFF
 
+@lru_cache(maxsize=128)
 def get_file_ext(fname):
     R"""
     Given a full path file name, return the file extension.
@@ -271,6 +316,13 @@ def last_backslash(fpath, action):
     return fpath[:-1]
 
 
+_PATH_TYPES = {
+    'u':po.APPPATH_USER if oext else po.PATHTYPE_USER,
+    'e':po.APPPATH_PROGRAM if oext else po.PATHTYPE_SYSTEM,
+    }
+#name rather than the function, so nothing holds on to the Origin application object
+_PATH_FN = 'Path' if oext else 'GetPath'
+
 def path(type = 'u'):
     r"""
     Returns one of the Origin pre-defned paths: User Files folder, Origin EXe folder,
@@ -290,19 +342,14 @@ def path(type = 'u'):
     if type == 'p':
         return get_lt_str('%X')
     if type == 'c':
-        return os.path.join(get_lt_str('%@D'), 'Central' + PATHSEP)
+        return os.path.join(_app_lt_str('%@D'), 'Central' + PATHSEP)
     if type == 'a':
         return get_lt_str('SYSTEM.PATH.PROJECTATTACHEDFILESPATH$')
-    path_types = {
-        'u':po.APPPATH_USER if oext else po.PATHTYPE_USER,
-        'e':po.APPPATH_PROGRAM if oext else po.PATHTYPE_SYSTEM,
-        }
-    otype = path_types.get(type, None)
+    otype = _PATH_TYPES.get(type, None)
     if otype is None:
         raise ValueError('Invalid path type')
 
-    fnpath = po.Path if oext else po.GetPath
-    return fnpath(otype)
+    return getattr(po, _PATH_FN)(otype)
 
 def wait(type = 'r', sec=0):
     """
@@ -347,12 +394,10 @@ def file_dialog(type, title=''):
         types = {'i': 'cvImageImp','t': 'ASCIIEXP','o':'OriginImport'}
         type_ = types[type]
 
-    po.LT_execute(f'__fname_for_py$="";dlgfile fname:=__fname_for_py group:="{type_}"'
-                   f' title:="{title}"')
-    fname=get_lt_str('__fname_for_py$')
-    po.LT_execute('del -vs __fname_for_py$')
-    return fname
+    with _LTTMPOUTSTR(labtalk=lambda name: f'dlgfile fname:={name} group:="{type_}" title:="{title}"') as pp:
+        return pp.get()
 
+@lru_cache(maxsize=32)
 def origin_class(name):
     'Get Origin base class'
     if not oext:
@@ -377,7 +422,7 @@ def color_col(offset=1, type='m'):
         plot.color = op.color_col(1,'n') #use index color, column needs to contain 1,2,3 etc
         plot.colormap="fire"
     """
-    return lt_int(f'color({offset}, {type})')
+    return _lt_color_int(f'color({offset}, {type})')
 
 def modi_col(offset=1):
     """
@@ -390,7 +435,7 @@ def modi_col(offset=1):
         plot.symbol_size = op.modi_col(1)# use next column to Y as symbol size
         plot.symbol_kind = op.modi_col(2)
     """
-    return lt_int(f'modifier({offset})')
+    return _lt_color_int(f'modifier({offset})')
 
 def org_ver():
     'Origin Version as float'
@@ -398,16 +443,36 @@ def org_ver():
 
 class _LTTMPOUTSTR:
     '''Receive temp string from Labtalk output'''
-    def __init__(self, text='', suffix=''):
-        self.name = '__PYLTOUTSTR' + suffix
+    #the LabTalk strings are kept for reuse instead of deleted after each use, one per nesting level,
+    #and emptied when the outermost one exits
+    _depth = [0]
+    _used = []
+    def __init__(self, text='', suffix='', labtalk=None):
+        self.suffix = suffix
+        self.name = ''
         self.text = text
+        #optional function of the string name, giving LabTalk to run in the same call that declares the string
+        self.labtalk = labtalk
 
     def __enter__(self):
-        po.LT_execute(f'string {self.name}{"=" + self.text if self.text else ""};')
+        depth = self._depth[0]
+        self.name = '__PYLTOUTSTR' + self.suffix + (str(depth) if depth else '')
+        #always assign, the reused string may still hold the last value
+        text = self.text if self.text else '""'
+        labtalk = self.labtalk(self.name) if self.labtalk else ''
+        po.LT_execute(f'string {self.name}={text};{labtalk}')
+        #only counted once declared, __exit__ does not run if the call above raises
+        self._depth[0] = depth + 1
+        if self.name not in self._used:
+            self._used.append(self.name)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        po.LT_execute(f'del -al {self.name}')
+        self._depth[0] -= 1
+        if not self._depth[0]:
+            #do not leave the last output in LabTalk between uses
+            po.LT_execute(';'.join(f'{name}$=""' for name in self._used))
+            self._used.clear()
 
     def get(self):
         'Get temp string name'
@@ -417,6 +482,7 @@ class _LTTMPOUTSTR:
 def make_DataRange(*args, rows=None):
     'Make Origin DataRange object'
     ranges = po.NewDataRange() if oext else origin_class('DataRange')()
+    matrix_cls = origin_class('MatrixObject')
     subs = []
     subrows = None
 
@@ -434,7 +500,7 @@ def make_DataRange(*args, rows=None):
             for sub in subs:
                 stype = sub[0]
                 col = sub[1]
-                if isinstance(col, origin_class('MatrixObject')):
+                if isinstance(col, matrix_cls):
                     ranges.AddMatrix(col.GetParent(), col.GetIndex())
                 else:
                     if isinstance(col, tuple):
@@ -485,25 +551,37 @@ def _tree_node_name_to_attributes_key_name(nodename):
     strAttsKeyName = _TREE_NODE_GET_ATTRIBUTES_KEY_PREFIX + nodename
     return strAttsKeyName
 
+def _flat_dict_to_xml(dd):
+    'what ET.tostring gives for a dict of leaf values, without building the tree'
+    parts = ["<?xml version='1.0' encoding='utf8'?>\n<root>"]
+    for k, v in dd.items():
+        text = _xml_escape(str(v))
+        parts.append(f'<{k}>{text}</{k}>' if text else f'<{k} />')
+    parts.append('</root>')
+    return ''.join(parts) if dd else "<?xml version='1.0' encoding='utf8'?>\n<root />"
+
 def _dict_to_xml_element_atts(dd, parent, key):
     attkey = _tree_node_name_to_attributes_key_name(key)
     if attkey in dd:       # does the dictionary key with the attributes exist?
         parent.attrib = dd[attkey].copy()
 
 def _dict_to_xml_element(dd, parent, bAttributes):
-    for k, v in dd.items():
-        if bAttributes:
-            attr = _tree_dict_is_key_attributes(k)
-            if attr:
-                parent.set(attr, str(v))
-                continue
-        child = ET.SubElement(parent, k)
-        if isinstance(v,  dict):
-            _dict_to_xml_element(v, child, bAttributes)
-        else:
-            child.text = str(v)
-        #if bAttributes:
-            #_dict_to_xml_element_atts(dd, child, k)
+    stack = [(dd, parent)]
+    while stack:
+        dd, parent = stack.pop()
+        for k, v in dd.items():
+            if bAttributes:
+                attr = _tree_dict_is_key_attributes(k)
+                if attr:
+                    parent.set(attr, str(v))
+                    continue
+            child = ET.SubElement(parent, k)
+            if isinstance(v,  dict):
+                stack.append((v, child))
+            else:
+                child.text = str(v)
+            #if bAttributes:
+                #_dict_to_xml_element_atts(dd, child, k)
 
 
 def _dict_to_xml(dd, bAttributes = False):
@@ -524,6 +602,8 @@ def _dict_to_xml(dd, bAttributes = False):
     xml = op._dict_to_xml(thedict)
     print(xml)
     """
+    if not bAttributes and not any(isinstance(v, dict) for v in dd.values()):
+        return _flat_dict_to_xml(dd)
     root = ET.Element('root')
     _dict_to_xml_element(dd, root, bAttributes)
     if bAttributes:
@@ -545,9 +625,8 @@ def lt_dict_to_tree(dd, treename, add_tree = False, check_attributes = False):
     strxml = _dict_to_xml(dd, check_attributes)
     strTempLTStringVar = '__strpytempvar'
     po.LT_set_str(strTempLTStringVar, strxml)   # set the xml string into a temp. LT string variable
-    if add_tree:
-        po.LT_execute(f'tree {treename}')
-    strLTexecute = (f'doc.settreevar({treename},'
+    strLTexecute = ((f'tree {treename};' if add_tree else '') +
+                    f'doc.settreevar({treename},'
                     f'{strTempLTStringVar}$);'
                     f'del -vs {strTempLTStringVar};')
     po.LT_execute(strLTexecute)
@@ -556,29 +635,64 @@ def lt_dict_to_tree(dd, treename, add_tree = False, check_attributes = False):
 def _tree_node_attributes_to_dict(dd, node, bRoot = False):
     atts = node.attrib      # this is a dictionary of attributes
     if atts:
-        dictAtts = atts.copy()
+        dictAtts = dict(atts)
         name = _tree_node_get_attributes_key_for_root() if bRoot else node.tag
         dd[_tree_node_name_to_attributes_key_name(name)] = dictAtts
 
 
+def _tree_node_value(node):
+    text = node.text
+    if text is None:
+        return '' # /// ML 04/02/2021 Empty nodes need to be preserved
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
 def _tree_to_dict(dd, node, bAttributes=False):
-    if any(True for _ in node):
-        dd2 = {}
-        for child in node:
-            _tree_to_dict(dd2, child, bAttributes)
-        dd[node.tag] = dd2
-    else:
-        text = node.text
-        if text is None:
-            dd[node.tag]='' # /// ML 04/02/2021 Empty nodes need to be preserved
+    #children are pushed in reverse so each dict is filled in document order
+    stack = [(dd, node)]
+    while stack:
+        dd, node = stack.pop()
+        children = list(node)
+        if children:
+            dd2 = {}
+            dd[node.tag] = dd2
+            stack.extend((dd2, child) for child in reversed(children))
         else:
-            try:
-                dd[node.tag] = float(text)
-            except ValueError:
-                dd[node.tag] = text
+            dd[node.tag] = _tree_node_value(node)
 
-    if bAttributes:
-        _tree_node_attributes_to_dict(dd, node)
+        if bAttributes:
+            _tree_node_attributes_to_dict(dd, node)
+
+def _tree_to_flat(flat, node, prefix):
+    for child in node:
+        path = prefix + child.tag
+        if any(True for _ in child):
+            _tree_to_flat(flat, child, path + '.')
+        else:
+            flat.append((path, _tree_node_value(child)))
+
+def _dict_to_flat(dd, prefix=''):
+    'flatten a nested dict into a list of (dotted path, leaf value)'
+    flat = []
+    for k, v in dd.items():
+        if isinstance(v, dict):
+            flat.extend(_dict_to_flat(v, f'{prefix}{k}.'))
+        else:
+            flat.append((prefix + k, v))
+    return flat
+
+def _flat_to_dict(flat):
+    'build the nested dict from a list of (dotted path, leaf value)'
+    dd = {}
+    for path, val in flat:
+        *branches, leaf = path.split('.')
+        sub = dd
+        for branch in branches:
+            sub = sub.setdefault(branch, {})
+        sub[leaf] = val
+    return dd
 
 def lt_tree_to_dict(name, add_attributes=False):
     """
@@ -601,7 +715,7 @@ def lt_tree_to_dict(name, add_attributes=False):
         xml = pp.get()
         if xml == name:
             return None
-        tr = ET.fromstring(xml)
+        tr = _parse_xml(xml)
         dd = {}
         for node in tr:
             _tree_to_dict(dd, node, add_attributes)
@@ -614,6 +728,27 @@ def lt_tree_to_dict(name, add_attributes=False):
 
         return dd
 
+def lt_tree_to_flat(name):
+    """
+    Get Labtalk tree leaves as a flat list
+    Parameters:
+        name (str): Name of the Labtalk tree
+    Returns:
+        list of (path, value) tuples, path is the dotted node path below the tree, like 'Parameters.Slope.Value'
+    Examples:
+        op.lt_exec('fitlr (1,2)')
+        for path, val in op.lt_tree_to_flat('fitlr'):
+            print(path, val)
+    """
+    name = name.upper()
+    with _LTTMPOUTSTR(name) as pp:
+        xml = pp.get()
+        if xml == name:
+            return None
+        flat = []
+        _tree_to_flat(flat, _parse_xml(xml), '')
+        return flat
+
 def lt_empty_tree():
     'An empty Labtalk tree'
     return ET.Element('OriginStorage')
@@ -634,5 +769,41 @@ def evaluate_FDF(ffname, indepvars, parameters):
     Examples:
         vx = [1, 2, 3]
         vy = op.evaluate_FDF('Gauss', vx, [1, 2, 3, 4])
-    """
-    return po.EvaluateFDF(ffname, indepvars, parameters)
+        #results for small inputs are cached, clear them after editing a fitting function
+        op.evaluate_FDF.cache_clear()
+    """
+    if not _FDF_cacheable(indepvars, parameters):
+        return po.EvaluateFDF(ffname, indepvars, parameters)
+    #a copy each call, so callers cannot change the cached result
+    return deepcopy(_evaluate_FDF(ffname, _FDF_key(indepvars), tuple(parameters)))
+
+#larger inputs are passed straight through, keying them would copy every value and pin them in the cache
+_FDF_CACHE_MAX_POINTS = 1000
+
+def _FDF_cacheable(indepvars, parameters):
+    'only small plain lists are cached, anything else like numpy arrays goes to Origin as it is'
+    if not isinstance(indepvars, list) or not isinstance(parameters, (list, tuple)):
+        return False
+    if len(indepvars) > _FDF_CACHE_MAX_POINTS:
+        return False
+    npts = 0
+    for v in indepvars:
+        if isinstance(v, list):
+            npts += len(v)
+        elif isinstance(v, (int, float)):
+            npts += 1
+        else:
+            return False
+    return npts <= _FDF_CACHE_MAX_POINTS
+
+def _FDF_key(indepvars):
+    'independent variables as (nested) tuples, to be used as a cache key'
+    return tuple(tuple(v) if isinstance(v, list) else v for v in indepvars)
+
+@lru_cache(maxsize=128)
+def _evaluate_FDF(ffname, indepvars, parameters):
+    """evaluate_FDF for hashable arguments, the result only depends on the function and the values"""
+    indepvars = [list(v) if isinstance(v, tuple) else v for v in indepvars]
+    return po.EvaluateFDF(ffname, indepvars, list(parameters))
+
+evaluate_FDF.cache_clear = _evaluate_FDF.cache_clear
@@ -53,6 +53,7 @@ class WSheet(DSheet):
     """
     This class represents an Origin Worksheet, it holds an instance of a PyOrigin Worksheet.
     """
+    __slots__ = ()
     # Adds a maximum of needecols columns beginning with c1 to
     # Origin worksheet wks:
     def _check_add_cols(self, needecols, c1 = 0):
@@ -143,10 +144,8 @@ class WSheet(DSheet):
 
     def _find_col(self, col):
         if not isinstance(col, int):
-            obj = self.obj.FindCol(col)
-            if obj is None:
-                return None
-            col = obj.GetIndex()
+            #FindCol already gives the column, no need to look it up again by index
+            return self.obj.FindCol(col)
         return self.obj[col]
 
     @property
@@ -944,6 +943,7 @@ class WBook(DBook):
     """
     This class represents an Origin Workbook, it holds an instance of a PyOrigin WorksheetPage.
     """
+    __slots__ = ()
     def _sheet(self, obj):
         return WSheet(obj)
 